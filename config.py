@@ -23,6 +23,17 @@ class Config:
     # Gemini model for text generation (RAG)
     # Options: "gemini-1.5-pro", "gemini-1.5-flash", "gemini-pro"
     GEMINI_GENERATION_MODEL = os.getenv("GEMINI_GENERATION_MODEL", "gemini-2.5-pro")
+    # Persistent embedding cache (SQLite file). Set to an empty string to disable.
+    EMBEDDING_CACHE_PATH = os.getenv("EMBEDDING_CACHE_PATH", "~/.docuflow/emb_cache.sqlite3")
+    # Maximum embeddings kept in the SQLite cache; oldest writes are evicted first
+    EMBEDDING_CACHE_MAX_ENTRIES = int(os.getenv("EMBEDDING_CACHE_MAX_ENTRIES", "100000"))
+    # Store cached embeddings as int8 + scale (4x smaller, approximate on read)
+    EMBEDDING_CACHE_INT8 = os.getenv("EMBEDDING_CACHE_INT8", "false").lower() == "true"
+    # Most frequently accessed queries loaded into memory at startup (0 disables warming)
+    EMBEDDING_CACHE_WARM_TOP_K = int(os.getenv("EMBEDDING_CACHE_WARM_TOP_K", "200"))
+    # Reject contract queries sharing no word with any stored contract before the vector search.
+    # Saves embedding calls but loses paraphrased matches; the vocabulary is per worker process.
+    TERM_FILTER_REJECT_UNMATCHED = os.getenv("TERM_FILTER_REJECT_UNMATCHED", "false").lower() == "true"
     
     # File upload configuration
     UPLOAD_DIR = os.getenv("UPLOAD_DIR", "/tmp")
@@ -1,4 +1,5 @@
 import json
+import numpy as np
 import psycopg2
 from psycopg2.extras import RealDictCursor
 from config import Config
@@ -32,6 +33,11 @@ class Database:
             logger.error(f"Error connecting to database: {e}")
             raise
     
+    @staticmethod
+    def _to_pgvector(vector):
+        """Convert an embedding (float32 ndarray or list) to pgvector format: '[0.1,0.2,...]'"""
+        return '[' + ','.join(map(str, np.asarray(vector, dtype=np.float32))) + ']'
+    
     def create_tables(self):
         """Create necessary database tables"""
         self.connect()  # Ensure connection is established
@@ -150,8 +156,7 @@ class Database:
         self.connect()  # Ensure connection is established
         try:
             with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
-                # Convert vector list to pgvector format: '[0.1, 0.2, ...]'
-                vector_str = '[' + ','.join(map(str, vector)) + ']'
+                vector_str = self._to_pgvector(vector)
                 
                 insert_query = """
                     INSERT INTO invoices (
@@ -406,8 +411,7 @@ class Database:
         self.connect()  # Ensure connection is established
         try:
             with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
-                # Convert vector list to pgvector format: '[0.1, 0.2, ...]'
-                vector_str = '[' + ','.join(map(str, vector)) + ']'
+                vector_str = self._to_pgvector(vector)
                 
                 insert_query = """
                     INSERT INTO contracts (
@@ -485,7 +489,7 @@ class Database:
         self.connect()
         try:
             with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
-                vector_str = '[' + ','.join(map(str, query_vector)) + ']'
+                vector_str = self._to_pgvector(query_vector)
                 base_query = """
                     SELECT
                         id,
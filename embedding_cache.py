@@ -0,0 +1,341 @@
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def quantize_int8(vec):
+    """
+    Symmetrically quantize an embedding to int8 with a single per-vector scale.
+    Returns (quantized int8 array, scale).
+    """
+    vec = np.asarray(vec, dtype=np.float32)
+    max_abs = float(np.abs(vec).max()) if vec.size else 0.0
+    scale = max_abs / 127.0 if max_abs > 0 else 1.0
+    q = np.round(vec / scale).astype(np.int8)
+    return q, scale
+
+
+def dequantize_int8(q, scale):
+    """
+    Recover an approximate float32 embedding from quantize_int8 output.
+    """
+    return np.asarray(q, dtype=np.float32) * np.float32(scale)
+
+
+class EmbeddingCache:
+    """
+    Two-tier embedding cache: an in-process LRU in front of a SQLite store.
+
+    Entries are keyed by sha256(model|task_type|text). Hot embeddings are
+    served from memory; colder ones are read from SQLite, where they are
+    stored as packed float32 blobs so they survive process restarts. Cache
+    hits never reach the Gemini API. With quantize=True new entries are
+    stored on disk as int8 plus a scale (4x smaller) and dequantized on read.
+    Pass path=None for a memory-only cache.
+
+    Callers can keep bulk entries (document embeddings) out of the memory
+    tier with memory=False so they do not evict hot query embeddings; such
+    entries are only held in memory when there is no disk tier.
+
+    The SQLite file also keeps access counts for recorded texts so the
+    hottest entries can be warmed into memory after a restart. Once more
+    than MAX_ACCESS_ENTRIES texts are tracked, older counts are halved and the
+    lowest are dropped, so warming follows recent traffic rather than keeping
+    early popular queries forever.
+
+    The SQLite tier is trimmed back to max_disk_entries embeddings every
+    PRUNE_INTERVAL writes, evicting the oldest writes first. SQLite errors (locked file, full disk,
+    read-only home) are logged and the cache degrades to its memory tier
+    instead of failing the embedding call.
+    """
+
+    # Buffered access counts are flushed to SQLite once this many keys are pending
+    ACCESS_FLUSH_THRESHOLD = 64
+    # Beyond this many tracked texts, counts are decayed and the lowest are dropped on flush
+    MAX_ACCESS_ENTRIES = 10000
+    # The disk tier is trimmed back to max_disk_entries once every this many writes
+    PRUNE_INTERVAL = 256
+
+    def __init__(
+        self,
+        path=None,
+        quantize: bool = False,
+        memory_size: int = 4096,
+        max_disk_entries: int = 100000,
+    ):
+        self.path = os.path.expanduser(path) if path else None
+        self.quantize = quantize
+        self.memory_size = memory_size
+        self.max_disk_entries = max_disk_entries
+        self._writes_since_prune = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+        self._pending_access = {}
+        self._lock = threading.Lock()
+        self._conn = None
+        if self.path is None:
+            return
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._lock:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS embeddings (
+                    key BLOB PRIMARY KEY,
+                    vector BLOB NOT NULL,
+                    scale REAL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+                """
+            )
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS access_counts (
+                    key BLOB PRIMARY KEY,
+                    model TEXT NOT NULL,
+                    task_type TEXT NOT NULL,
+                    text TEXT NOT NULL,
+                    hits INTEGER NOT NULL DEFAULT 0,
+                    last_accessed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+                """
+            )
+            # Caches created before int8 support lack the scale column
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(embeddings)")}
+            if "scale" not in columns:
+                self._conn.execute("ALTER TABLE embeddings ADD COLUMN scale REAL")
+            self._conn.commit()
+        logger.info("Embedding cache opened at %s", self.path)
+
+    @staticmethod
+    def make_key(model: str, task_type: str, text: str) -> bytes:
+        """
+        Build the cache key for an embedding request.
+        """
+        return hashlib.sha256(f"{model}|{task_type}|{text}".encode("utf-8")).digest()
+
+    def _remember(self, key: bytes, embedding) -> None:
+        # Caller must hold self._lock
+        self._memory[key] = embedding
+        self._memory.move_to_end(key)
+        if len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def _read_disk_locked(self, key: bytes):
+        # Caller must hold self._lock
+        if self._conn is None:
+            return None
+        try:
+            return self._conn.execute(
+                "SELECT vector, scale FROM embeddings WHERE key = ?", (key,)
+            ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning("Embedding cache read failed, using memory tier only: %s", e)
+            return None
+
+    @staticmethod
+    def _decode(row):
+        blob, scale = row
+        if scale is None:
+            return np.frombuffer(blob, dtype=np.float32)
+        embedding = dequantize_int8(np.frombuffer(blob, dtype=np.int8), scale)
+        embedding.setflags(write=False)
+        return embedding
+
+    def get(self, key: bytes, memory: bool = True):
+        """
+        Return the cached embedding as a read-only float32 array, or None on a miss.
+        Disk hits are promoted into the in-memory tier unless memory=False.
+        """
+        with self._lock:
+            embedding = self._memory.get(key)
+            if embedding is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return embedding
+            row = self._read_disk_locked(key)
+            if row is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+
+        embedding = self._decode(row)
+        if memory:
+            with self._lock:
+                self._remember(key, embedding)
+        return embedding
+
+    def load(self, key: bytes) -> bool:
+        """
+        Promote an entry from disk into the in-memory tier without counting a hit
+        or miss. Returns False if the key is not cached in either tier.
+        """
+        with self._lock:
+            if key in self._memory:
+                return True
+            row = self._read_disk_locked(key)
+        if row is None:
+            return False
+        embedding = self._decode(row)
+        with self._lock:
+            self._remember(key, embedding)
+        return True
+
+    def set(self, key: bytes, embedding, memory: bool = True) -> None:
+        """
+        Write an embedding through to both tiers, or to SQLite only when
+        memory=False. The in-memory copy is shared with later callers, so the
+        array is marked read-only. On disk it is stored as float32 bytes, or
+        int8 bytes plus scale when quantizing.
+        """
+        embedding = np.asarray(embedding, dtype=np.float32)
+        embedding.setflags(write=False)
+        if self._conn is not None:
+            if self.quantize:
+                q, scale = quantize_int8(embedding)
+                blob = q.tobytes()
+            else:
+                blob = embedding.tobytes()
+                scale = None
+        with self._lock:
+            if memory or self._conn is None:
+                self._remember(key, embedding)
+            if self._conn is not None:
+                try:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO embeddings (key, vector, scale) VALUES (?, ?, ?)",
+                        (key, blob, scale),
+                    )
+                    self._writes_since_prune += 1
+                    if self._writes_since_prune >= self.PRUNE_INTERVAL:
+                        self._prune_locked()
+                    self._conn.commit()
+                except sqlite3.Error as e:
+                    logger.warning("Embedding cache write failed: %s", e)
+
+    def _prune_locked(self) -> None:
+        # Caller must hold self._lock. REPLACE assigns a fresh rowid, so rowid order
+        # is write order and at most max_disk_entries rows survive this delete.
+        self._writes_since_prune = 0
+        self._conn.execute(
+            "DELETE FROM embeddings WHERE rowid <= (SELECT MAX(rowid) FROM embeddings) - ?",
+            (self.max_disk_entries,),
+        )
+
+    def record_access(self, model: str, task_type: str, text: str) -> None:
+        """
+        Count an access to a text so it can be warmed on the next start.
+        Counts are buffered in memory and flushed to SQLite in batches.
+        """
+        if self._conn is None:
+            return
+        key = self.make_key(model, task_type, text)
+        with self._lock:
+            entry = self._pending_access.get(key)
+            if entry is None:
+                self._pending_access[key] = [model, task_type, text, 1]
+            else:
+                entry[3] += 1
+            if len(self._pending_access) >= self.ACCESS_FLUSH_THRESHOLD:
+                self._flush_access_locked()
+
+    def _flush_access_locked(self) -> None:
+        # Caller must hold self._lock
+        if not self._pending_access or self._conn is None:
+            return
+        try:
+            self._conn.executemany(
+                """
+                INSERT INTO access_counts (key, model, task_type, text, hits)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(key) DO UPDATE SET
+                    hits = hits + excluded.hits,
+                    last_accessed_at = CURRENT_TIMESTAMP
+                """,
+                [(key, *entry) for key, entry in self._pending_access.items()],
+            )
+            self._trim_access_locked(list(self._pending_access))
+            self._conn.commit()
+        except sqlite3.Error as e:
+            logger.warning("Failed to flush embedding cache access counts: %s", e)
+        # Drop the buffer either way so a broken disk tier cannot grow it without bound
+        self._pending_access.clear()
+
+    def _trim_access_locked(self, flushed_keys: list) -> None:
+        # Caller must hold self._lock. Rows upserted in this flush are exempt from
+        # decay and eviction so a new query gets the chance to accumulate hits.
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM access_counts").fetchone()
+        if count <= self.MAX_ACCESS_ENTRIES:
+            return
+        placeholders = ",".join("?" * len(flushed_keys))
+        self._conn.execute(
+            f"UPDATE access_counts SET hits = hits / 2 WHERE key NOT IN ({placeholders})",
+            flushed_keys,
+        )
+        self._conn.execute(
+            f"""
+            DELETE FROM access_counts
+            WHERE key NOT IN ({placeholders}) AND key NOT IN (
+                SELECT key FROM access_counts
+                WHERE key NOT IN ({placeholders})
+                ORDER BY hits DESC, last_accessed_at DESC
+                LIMIT ?
+            )
+            """,
+            (*flushed_keys, *flushed_keys, max(self.MAX_ACCESS_ENTRIES - len(flushed_keys), 0)),
+        )
+
+    def top_accessed(self, model: str, limit: int) -> list:
+        """
+        Return the most frequently accessed (key, task_type, text) entries for a model.
+        """
+        if self._conn is None:
+            return []
+        with self._lock:
+            self._flush_access_locked()
+            try:
+                return self._conn.execute(
+                    """
+                    SELECT key, task_type, text FROM access_counts
+                    WHERE model = ?
+                    ORDER BY hits DESC, last_accessed_at DESC
+                    LIMIT ?
+                    """,
+                    (model, limit),
+                ).fetchall()
+            except sqlite3.Error as e:
+                logger.warning("Failed to read embedding cache access counts: %s", e)
+                return []
+
+    def stats(self) -> dict:
+        """
+        Return per-tier hit/miss counters for observability.
+        """
+        with self._lock:
+            return {
+                "path": self.path,
+                "quantize": self.quantize,
+                "memory_entries": len(self._memory),
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._flush_access_locked()
+                self._conn.close()
+                self._conn = None
@@ -10,7 +10,8 @@ from config import Config
 from database import Database
 from compliance_engine import ComplianceEngine
 from document_processor import DocumentProcessor
-from vectorizer import Vectorizer
+from term_filter import TermFilter
+from vectorizer import get_vectorizer
 
 # Configure logging
 logging.basicConfig(
@@ -24,6 +25,7 @@ origins = [
 ]
 
 DEFAULT_BULK_LIMIT = 200
+TERM_FILTER_PAGE_SIZE = 500
 
 
 app = FastAPI(title="Document Processing API", version="1.0.0")
@@ -61,14 +63,30 @@ class InvoiceListRequest(BaseModel):
 # Initialize components
 db = Database()
 document_processor = DocumentProcessor()
-vectorizer = Vectorizer()
+vectorizer = get_vectorizer()
 compliance_engine = ComplianceEngine(db=db, vectorizer=vectorizer)
+term_filter = TermFilter(require_shared_terms=Config.TERM_FILTER_REJECT_UNMATCHED)
+
+def load_term_filter():
+    """Build the contract term filter from every stored contract"""
+    if not term_filter.require_shared_terms:
+        return
+    offset = 0
+    while True:
+        contracts = db.get_all_contracts(limit=TERM_FILTER_PAGE_SIZE, offset=offset)
+        for contract in contracts:
+            term_filter.add_text(contract.get('contract_id'), contract.get('summary'), contract.get('text'))
+        if len(contracts) < TERM_FILTER_PAGE_SIZE:
+            break
+        offset += TERM_FILTER_PAGE_SIZE
+    term_filter.mark_ready()
 
 # Create tables on startup
 @app.on_event("startup")
 async def startup_event():
     try:
         db.create_tables()
+        load_term_filter()
         logger.info("Application started successfully")
     except Exception as e:
         logger.warning(f"Database connection failed during startup: {e}")
@@ -79,6 +97,7 @@ async def startup_event():
 @app.on_event("shutdown")
 async def shutdown_event():
     db.close()
+    vectorizer.close()
     logger.info("Application shutdown")
 
 @app.get("/")
@@ -334,7 +353,7 @@ async def upload_document(
             metadata = document_processor.extract_contract_data(str(file_path))
         
         # Vectorize the metadata
-        vector = vectorizer.vectorize_metadata(metadata)
+        vector = await vectorizer.avectorize_metadata(metadata)
         
         # Store in database based on document type
         if doc_type == 'invoice':
@@ -354,6 +373,8 @@ async def upload_document(
             }
         elif doc_type == 'contract':
             stored_record = db.insert_contract(metadata, vector)
+            if term_filter.require_shared_terms:
+                term_filter.add_text(metadata.get('contract_id'), metadata.get('summary'), metadata.get('text'))
             logger.info(f"Successfully processed and stored contract: {metadata.get('contract_id')}")
             
             # Return contract metadata
@@ -491,8 +512,20 @@ async def query_contracts(request: ContractQueryRequest = Body(...)):
         log_msg += f" (limit: {request.limit}, threshold: {request.similarity_threshold})"
         logger.info(log_msg)
         
+        # Skip embedding and vector search for stopword-only queries (and, if enabled,
+        # queries sharing no term with any stored contract)
+        if not term_filter.might_match(request.query):
+            logger.info("Query cannot match any stored contract; skipping vector search")
+            return JSONResponse(
+                status_code=200,
+                content={
+                    "success": True,
+                    "answer": "No relevant contracts found matching your query."
+                }
+            )
+        
         # Vectorize the query text
-        query_vector = vectorizer.vectorize_query(request.query.strip())
+        query_vector = await vectorizer.avectorize_query(request.query.strip(), record=True)
         
         # Search contracts by similarity
         results = db.search_contracts_by_similarity(
@@ -527,7 +560,7 @@ async def query_contracts(request: ContractQueryRequest = Body(...)):
         
         # Generate answer using LLM (RAG)
         try:
-            answer = vectorizer.generate_answer(
+            answer = await vectorizer.agenerate_answer(
                 query=request.query.strip(),
                 context_texts=context_texts,
                 contract_ids=contract_ids if contract_ids else None
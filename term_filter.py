@@ -0,0 +1,131 @@
+import logging
+import re
+import threading
+import unicodedata
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_RE = re.compile(r"\w+")
+
+# Common English function words plus question phrasing that carries no search signal
+_STOPWORDS = frozenset({
+    "a", "about", "all", "an", "and", "any", "are", "as", "at", "be", "by", "can",
+    "could", "did", "do", "does", "for", "from", "had", "has", "have", "how", "i",
+    "if", "in", "into", "is", "it", "its", "me", "my", "of", "on", "or", "our",
+    "please", "should", "so", "tell", "than", "that", "the", "their", "them",
+    "there", "these", "they", "this", "those", "to", "us", "was", "we", "were",
+    "what", "whats", "when", "where", "which", "who", "why", "will", "with",
+    "would", "you", "your",
+})
+
+
+def _words(text):
+    return _TOKEN_RE.findall(text.casefold()) if text else []
+
+
+def normalize_token(token):
+    """
+    Fold simple English plurals so singular and plural forms share one term:
+    penalties/penalty -> penalty, clauses/clause -> claus, taxes/tax -> tax.
+    """
+    if len(token) > 4 and token.endswith("ies"):
+        return token[:-3] + "y"
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        token = token[:-1]
+    if len(token) > 2 and token.endswith("e"):
+        token = token[:-1]
+    return token
+
+
+def _significant(words):
+    return {
+        normalize_token(word)
+        for word in words
+        if len(word) > 1 and word not in _STOPWORDS
+    }
+
+
+def significant_tokens(text):
+    """
+    Case-fold, split into words, drop stopwords and single characters, and fold plurals.
+    """
+    return _significant(_words(text))
+
+
+def _has_untokenized_content(text):
+    """
+    True if text contains characters other than words, whitespace and punctuation
+    (currency signs, other symbols, emoji), which the filter cannot reason about.
+    """
+    for char in _TOKEN_RE.sub("", text):
+        category = unicodedata.category(char)
+        if not (char.isspace() or category.startswith("P")):
+            return True
+    return False
+
+
+class TermFilter:
+    """
+    Cheap pre-check that lets the query path skip the embedding call and the
+    vector search for queries that cannot be answered.
+
+    By default only empty and stopword-only queries are rejected. With
+    require_shared_terms=True the filter also keeps a vocabulary of significant
+    tokens across ingested contracts and rejects queries that share no term
+    with it. That trades recall for cost: paraphrases ("cancellation charge"
+    for "termination fee") are rejected although the semantic search would
+    match them, and the vocabulary is per process, so contracts uploaded
+    through another worker are unknown until restart. Until the vocabulary
+    has been loaded the term check admits every query.
+
+    The term check errs towards admitting: queries with non-ASCII words
+    (scripts without word spacing or with inflections the plural folding does
+    not cover) always pass it.
+    """
+
+    def __init__(self, require_shared_terms: bool = False):
+        self.require_shared_terms = require_shared_terms
+        self._terms = set()
+        self._lock = threading.Lock()
+        self.ready = False
+
+    def add_text(self, *texts):
+        """
+        Add the significant tokens of one or more texts to the vocabulary.
+        """
+        tokens = set()
+        for text in texts:
+            tokens |= significant_tokens(text)
+        with self._lock:
+            self._terms |= tokens
+
+    def mark_ready(self):
+        """
+        Start filtering once the vocabulary reflects every stored contract.
+        """
+        with self._lock:
+            self.ready = True
+            logger.info("Term filter loaded with %d distinct terms", len(self._terms))
+
+    def might_match(self, query_text):
+        """
+        Return False only when the query cannot match any ingested contract.
+        """
+        words = _words(query_text)
+        if not words:
+            # Nothing to search for, unless the query holds symbols that do not tokenize
+            return _has_untokenized_content(query_text or "")
+        if all(word in _STOPWORDS for word in words):
+            return _has_untokenized_content(query_text)
+        if not self.require_shared_terms or not self.ready:
+            return True
+        if any(not word.isascii() for word in words):
+            return True
+        tokens = _significant(words)
+        if not tokens:
+            return True
+        with self._lock:
+            return not tokens.isdisjoint(self._terms)
+
+    def __len__(self):
+        return len(self._terms)
@@ -1,13 +1,29 @@
 """
 Simple test script for the Document Processing API
 Usage: 
-    python test_api.py invoice <path_to_invoice.pdf>
-    python test_api.py contract <path_to_contract.pdf>
+    python test_api.py invoice <path_to_invoice.pdf> [--concurrency N]
+    python test_api.py contract <path_to_contract.pdf> [--concurrency N]
+
+With --concurrency N the document is uploaded N times in parallel over a shared,
+keep-alive connection pool (useful for load testing).
 """
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 import requests
+from requests.adapters import DEFAULT_POOLSIZE, HTTPAdapter
+from requests_toolbelt import MultipartEncoder
 import os
 
+# Shared session so repeated uploads reuse TCP connections instead of reconnecting each time
+SESSION = requests.Session()
+
+def size_connection_pool(concurrency):
+    """Keep one pooled connection per upload thread so none are discarded after use"""
+    pool_size = max(concurrency, DEFAULT_POOLSIZE)
+    SESSION.mount("http://", HTTPAdapter(pool_maxsize=pool_size))
+    SESSION.mount("https://", HTTPAdapter(pool_maxsize=pool_size))
+
 def test_upload_invoice(pdf_path):
     """Test the upload_document endpoint with an invoice"""
     url = "http://localhost:8001/upload_document"
@@ -17,13 +33,21 @@ def test_upload_invoice(pdf_path):
         return
     
     with open(pdf_path, 'rb') as f:
-        files = {'file': (os.path.basename(pdf_path), f, 'application/pdf')}
-        data = {'document_type': 'invoice'}
+        # Stream the multipart body from disk instead of building it in memory
+        encoder = MultipartEncoder(fields={
+            'file': (os.path.basename(pdf_path), f, 'application/pdf'),
+            'document_type': 'invoice',
+        })
         
         print(f"Uploading invoice: {pdf_path}...")
         try:
             # Add timeout to prevent hanging (5 minutes for document processing)
-            response = requests.post(url, files=files, data=data, timeout=300)
+            response = SESSION.post(
+                url,
+                data=encoder,
+                headers={'Content-Type': encoder.content_type},
+                timeout=300,
+            )
             
             if response.status_code == 200:
                 result = response.json()
@@ -56,13 +80,21 @@ def test_upload_contract(pdf_path):
         return
     
     with open(pdf_path, 'rb') as f:
-        files = {'file': (os.path.basename(pdf_path), f, 'application/pdf')}
-        data = {'document_type': 'contract'}
+        # Stream the multipart body from disk instead of building it in memory
+        encoder = MultipartEncoder(fields={
+            'file': (os.path.basename(pdf_path), f, 'application/pdf'),
+            'document_type': 'contract',
+        })
         
         print(f"Uploading contract: {pdf_path}...")
         try:
             # Add timeout to prevent hanging (5 minutes for document processing)
-            response = requests.post(url, files=files, data=data, timeout=300)
+            response = SESSION.post(
+                url,
+                data=encoder,
+                headers={'Content-Type': encoder.content_type},
+                timeout=300,
+            )
             
             if response.status_code == 200:
                 result = response.json()
@@ -90,21 +122,51 @@ def test_upload_contract(pdf_path):
         except Exception as e:
             print(f"Error: {e}")
 
+def run_concurrent(upload_fn, pdf_path, concurrency):
+    """Upload the same document `concurrency` times in parallel over the shared session"""
+    print(f"Running {concurrency} concurrent uploads...")
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = [executor.submit(upload_fn, pdf_path) for _ in range(concurrency)]
+        for future in futures:
+            future.result()
+    elapsed = time.perf_counter() - start
+    print(f"\nCompleted {concurrency} uploads in {elapsed:.2f}s ({concurrency / elapsed:.2f} uploads/s)")
+
 if __name__ == "__main__":
-    if len(sys.argv) < 3:
+    args = sys.argv[1:]
+    concurrency = 1
+    if "--concurrency" in args:
+        flag_index = args.index("--concurrency")
+        try:
+            concurrency = int(args[flag_index + 1])
+        except (IndexError, ValueError):
+            print("Error: --concurrency requires an integer value")
+            sys.exit(1)
+        if concurrency < 1:
+            print("Error: --concurrency must be at least 1")
+            sys.exit(1)
+        del args[flag_index:flag_index + 2]
+    
+    if len(args) < 2:
         print("Usage:")
-        print("  python test_api.py invoice <path_to_invoice.pdf>")
-        print("  python test_api.py contract <path_to_contract.pdf>")
+        print("  python test_api.py invoice <path_to_invoice.pdf> [--concurrency N]")
+        print("  python test_api.py contract <path_to_contract.pdf> [--concurrency N]")
         sys.exit(1)
     
-    doc_type = sys.argv[1].lower()
-    pdf_path = sys.argv[2]
+    doc_type = args[0].lower()
+    pdf_path = args[1]
     
     if doc_type == 'invoice':
-        test_upload_invoice(pdf_path)
+        upload_fn = test_upload_invoice
     elif doc_type == 'contract':
-        test_upload_contract(pdf_path)
+        upload_fn = test_upload_contract
     else:
         print(f"Error: Unknown document type '{doc_type}'. Use 'invoice' or 'contract'")
         sys.exit(1)
-
+    
+    size_connection_pool(concurrency)
+    if concurrency > 1:
+        run_concurrent(upload_fn, pdf_path, concurrency)
+    else:
+        upload_fn(pdf_path)
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""Tests for the embedding cache access-count tracking used for warm-up"""
+import os
+import tempfile
+
+from embedding_cache import EmbeddingCache
+
+
+def _make_cache(directory):
+    cache = EmbeddingCache(path=os.path.join(directory, "emb_cache.sqlite3"))
+    cache.MAX_ACCESS_ENTRIES = 3
+    cache.ACCESS_FLUSH_THRESHOLD = 2
+    return cache
+
+
+def _top_texts(cache, limit):
+    return [text for _, _, text in cache.top_accessed("model", limit)]
+
+
+def test_new_query_displaces_old_popular_queries():
+    with tempfile.TemporaryDirectory() as directory:
+        cache = _make_cache(directory)
+        for text in ("old1", "old2", "old3"):
+            for _ in range(10):
+                cache.record_access("model", "RETRIEVAL_QUERY", text)
+        cache.top_accessed("model", 3)  # flush
+
+        # "new" is always flushed alongside one other, one-off query
+        for i in range(50):
+            cache.record_access("model", "RETRIEVAL_QUERY", "new")
+            cache.record_access("model", "RETRIEVAL_QUERY", f"other{i}")
+
+        top = _top_texts(cache, 3)
+        assert top[0] == "new", top
+        assert len(cache._conn.execute("SELECT key FROM access_counts").fetchall()) <= 3
+        cache.close()
+
+
+def test_counts_are_kept_below_the_cap():
+    with tempfile.TemporaryDirectory() as directory:
+        cache = _make_cache(directory)
+        cache.record_access("model", "RETRIEVAL_QUERY", "a")
+        cache.record_access("model", "RETRIEVAL_QUERY", "a")
+        cache.record_access("model", "RETRIEVAL_QUERY", "b")
+        assert _top_texts(cache, 3) == ["a", "b"]
+        cache.close()
+
+
+if __name__ == "__main__":
+    test_new_query_displaces_old_popular_queries()
+    test_counts_are_kept_below_the_cap()
+    print("✅ All embedding cache tests passed")
@@ -1,11 +1,271 @@
+import asyncio
+import functools
 import json
 import logging
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from google.api_core import exceptions as google_exceptions
 import google.generativeai as genai
+import numpy as np
 from config import Config
+from embedding_cache import EmbeddingCache
 
 logger = logging.getLogger(__name__)
 
+# Embeddings kept in the in-process tier of the embedding cache
+MEMORY_CACHE_SIZE = 4096
+# Maximum number of texts per batchEmbedContents request
+EMBED_BATCH_SIZE = 100
+# Longest text sent to the embedding model in one request (~2k tokens for embedding-001)
+_MAX_EMBED_CHARS = 8000
+# Characters shared by consecutive windows when a long document is split
+_EMBED_WINDOW_OVERLAP = 500
+# Worker threads used by the async wrappers around blocking Gemini SDK calls
+EXECUTOR_MAX_WORKERS = 16
+
+
+_embedding_cache = None
+_embedding_cache_lock = threading.Lock()
+
+
+def _get_embedding_cache():
+    """
+    Open the two-tier embedding cache once per process.
+    Falls back to a memory-only cache when the SQLite tier is disabled or cannot be opened.
+    Guarded by a lock because the warm-up thread and pool workers may race on first use.
+    """
+    global _embedding_cache
+    if _embedding_cache is not None:
+        return _embedding_cache
+    with _embedding_cache_lock:
+        if _embedding_cache is None:
+            _embedding_cache = _open_embedding_cache()
+    return _embedding_cache
+
+
+def _open_embedding_cache():
+    if Config.EMBEDDING_CACHE_PATH:
+        try:
+            return EmbeddingCache(
+                Config.EMBEDDING_CACHE_PATH,
+                quantize=Config.EMBEDDING_CACHE_INT8,
+                memory_size=MEMORY_CACHE_SIZE,
+                max_disk_entries=Config.EMBEDDING_CACHE_MAX_ENTRIES,
+            )
+        except Exception as e:
+            logger.warning(f"Persistent embedding cache disabled, could not open {Config.EMBEDDING_CACHE_PATH}: {e}")
+    return EmbeddingCache(memory_size=MEMORY_CACHE_SIZE)
+
+
+# (metadata key, label) pairs embedded for invoices and contracts, in output order.
+# Long contract text is windowed before embedding (see _embed_document); summary is common to both.
+_METADATA_FIELDS = (
+    # Invoice metadata
+    ("invoice_id", "Invoice ID"),
+    ("seller_name", "Seller"),
+    ("seller_address", "Address"),
+    ("tax_id", "Tax ID"),
+    ("subtotal_amount", "Subtotal"),
+    ("tax_amount", "Tax"),
+    # Contract metadata
+    ("contract_id", "Contract ID"),
+    ("text", "Text"),
+    ("summary", "Summary"),
+)
+
+
+def _metadata_to_text(metadata: dict) -> str:
+    """
+    Build the text representation of invoice or contract metadata that gets embedded.
+    Kept as a typed, dependency-free function so it stays cheap in batch ingest loops.
+    """
+    get = metadata.get
+    return " | ".join([
+        f"{label}: {value}"
+        for key, label in _METADATA_FIELDS
+        if (value := get(key))
+    ])
+
+
+# google-generativeai >= 0.3 returns a plain dict from embed_content:
+# {'embedding': [floats]} for a single text, {'embedding': [[floats], ...]} for a list.
+# Check the SDK once at import instead of probing the response shape on every call.
+_GENAI_VERSION = tuple(int(part) for part in re.findall(r"\d+", genai.__version__)[:2])
+if _GENAI_VERSION < (0, 3):
+    raise ImportError(
+        f"google-generativeai>=0.3 is required for embed_content responses, found {genai.__version__}"
+    )
+
+
+def _extract_embedding(result):
+    """
+    Pull the embedding payload out of an embed_content response as a float32 array.
+    For list inputs this is a 2-D array with one row per input text.
+    """
+    return np.asarray(result['embedding'], dtype=np.float32)
+
+
+def _use_memory_tier(task_type):
+    """
+    Document embeddings are written once and rarely re-read, so they go to the
+    disk tier only and leave the in-memory LRU to query embeddings.
+    """
+    return task_type != "RETRIEVAL_DOCUMENT"
+
+
+def _embed_text(model, text, task_type, cache=True):
+    """
+    Embed a single text, consulting the memory and disk cache tiers before calling Gemini.
+    With cache=False the embedding cache is neither read nor written.
+    """
+    if cache:
+        embedding_cache = _get_embedding_cache()
+        key = EmbeddingCache.make_key(model, task_type, text)
+        memory = _use_memory_tier(task_type)
+        cached = embedding_cache.get(key, memory=memory)
+        if cached is not None:
+            return cached
+
+    result = genai.embed_content(
+        model=model,
+        content=text,
+        task_type=task_type
+    )
+
+    embedding = _extract_embedding(result)
+    if cache:
+        embedding_cache.set(key, embedding, memory=memory)
+    return embedding
+
+
+def _embed_texts(model, texts, task_type, cache=True):
+    """
+    Embed many texts, batching cache misses into single embed_content calls.
+    Falls back to one request per text only when a batch is rejected for its
+    inputs (InvalidArgument or a length mismatch); quota and auth errors such as
+    ResourceExhausted, PermissionDenied or Unauthenticated propagate unchanged.
+    With cache=False the embedding cache is neither read nor written.
+    Returns embeddings in the same order as texts.
+    """
+    embeddings = [None] * len(texts)
+    if cache:
+        embedding_cache = _get_embedding_cache()
+        keys = [EmbeddingCache.make_key(model, task_type, text) for text in texts]
+        memory = _use_memory_tier(task_type)
+        missing = []
+        for i, key in enumerate(keys):
+            cached = embedding_cache.get(key, memory=memory)
+            if cached is not None:
+                embeddings[i] = cached
+            else:
+                missing.append(i)
+    else:
+        missing = list(range(len(texts)))
+
+    for start in range(0, len(missing), EMBED_BATCH_SIZE):
+        chunk = missing[start:start + EMBED_BATCH_SIZE]
+        try:
+            result = genai.embed_content(
+                model=model,
+                content=[texts[i] for i in chunk],
+                task_type=task_type
+            )
+            batch = _extract_embedding(result)
+            if len(batch) != len(chunk):
+                raise ValueError(f"Expected {len(chunk)} embeddings, got {len(batch)}")
+        except (google_exceptions.InvalidArgument, ValueError) as e:
+            logger.warning(f"Batch embedding of {len(chunk)} texts failed, retrying individually: {e}")
+            for i in chunk:
+                embeddings[i] = _embed_text(model, texts[i], task_type, cache=cache)
+            continue
+
+        for i, embedding in zip(chunk, batch):
+            embeddings[i] = embedding
+            if cache:
+                embedding_cache.set(keys[i], embedding, memory=memory)
+
+    return embeddings
+
+
+def _split_windows(text):
+    """
+    Split text into overlapping windows of at most _MAX_EMBED_CHARS characters.
+    """
+    step = _MAX_EMBED_CHARS - _EMBED_WINDOW_OVERLAP
+    return [
+        text[start:start + _MAX_EMBED_CHARS]
+        for start in range(0, len(text) - _EMBED_WINDOW_OVERLAP, step)
+    ]
+
+
+def _embed_document(model, text):
+    """
+    Embed a document with RETRIEVAL_DOCUMENT task type, bounding the size of each request.
+    Texts longer than _MAX_EMBED_CHARS are split into overlapping windows, embedded
+    through the batch API, and averaged (weighted by window length) into a single
+    unit-length vector. Only the averaged vector is cached; the windows themselves
+    are never looked up again.
+    """
+    if len(text) <= _MAX_EMBED_CHARS:
+        return _embed_text(model, text, "RETRIEVAL_DOCUMENT")
+
+    cache = _get_embedding_cache()
+    key = EmbeddingCache.make_key(model, "RETRIEVAL_DOCUMENT", text)
+    cached = cache.get(key, memory=False)
+    if cached is not None:
+        return cached
+
+    windows = _split_windows(text)
+    # Weight by length so a short, mostly-overlap tail window does not skew the vector
+    embedding = np.average(
+        np.stack(_embed_texts(model, windows, "RETRIEVAL_DOCUMENT", cache=False)),
+        axis=0,
+        weights=[len(window) for window in windows],
+    ).astype(np.float32)
+    norm = np.linalg.norm(embedding)
+    if norm > 0:
+        embedding /= norm
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Embedded %d chars as the mean of %d windows", len(text), len(windows))
+    cache.set(key, embedding, memory=False)
+    return embedding
+
+
+def _normalize_query(query_text):
+    """
+    Canonicalize a query so trivially different phrasings share one cache entry:
+    case-folded, whitespace collapsed, trailing sentence punctuation dropped.
+    """
+    normalized = " ".join(query_text.casefold().split()).rstrip("?!. ")
+    return normalized or query_text.strip()
+
+
+_CONTEXT_SEPARATOR = "\n\n---\n\n"
+
+# RAG answer prompt, split around the per-call context and question
+_ANSWER_PROMPT_HEAD = """You are a helpful assistant that answers questions about contracts based on the provided contract excerpts.
+
+Use the following contract excerpts to answer the user's question. If the information is not available in the provided excerpts, say so clearly.
+
+Contract Excerpts:
+"""
+_ANSWER_PROMPT_QUESTION = """
+
+User Question: """
+_ANSWER_PROMPT_TAIL = """
+
+Please provide a clear, accurate answer based on the contract excerpts above. If you reference specific information, mention which contract it comes from if available."""
+
+
 class Vectorizer:
+    # Generative model handles shared by all instances, keyed by model name
+    _model_cache = {}
+    # Generation model name that initialized successfully; resolved on first use
+    _resolved_model_name = None
+    # Whether the verbose dump of an unparseable response has been logged yet
+    _response_diagnostics_logged = False
+
     def __init__(self):
         # Use GEMINI_API_KEY, fallback to VERTEX_AI if needed
         api_key = Config.GEMINI_API_KEY or Config.VERTEX_AI
@@ -13,138 +273,177 @@ class Vectorizer:
             raise ValueError("GEMINI_API_KEY or VERTEX_AI must be set in environment variables")
         genai.configure(api_key=api_key)
         self.model = Config.EMBEDDING_MODEL
+        self._pool = ThreadPoolExecutor(
+            max_workers=EXECUTOR_MAX_WORKERS,
+            thread_name_prefix="vectorizer",
+        )
+        if Config.EMBEDDING_CACHE_WARM_TOP_K > 0:
+            threading.Thread(target=self._warm, name="vectorizer-warm", daemon=True).start()
+    
+    def close(self):
+        """
+        Shut down the worker pool used by the async methods and flush the embedding cache.
+        """
+        self._pool.shutdown(wait=False)
+        _get_embedding_cache().close()
+    
+    def _warm(self):
+        """
+        Load the most frequently accessed texts into the in-memory cache tier.
+        Entries missing from disk are re-embedded through the batch API.
+        """
+        try:
+            cache = _get_embedding_cache()
+            entries = cache.top_accessed(self.model, Config.EMBEDDING_CACHE_WARM_TOP_K)
+            missing = {}
+            for key, task_type, text in entries:
+                if not cache.load(key):
+                    missing.setdefault(task_type, []).append(text)
+            for task_type, texts in missing.items():
+                _embed_texts(self.model, texts, task_type)
+            logger.info(
+                f"Warmed embedding cache with {len(entries)} entries "
+                f"({sum(len(t) for t in missing.values())} re-embedded)"
+            )
+        except Exception as e:
+            logger.warning(f"Embedding cache warm-up failed: {e}")
+    
+    async def _run_in_pool(self, func, *args, **kwargs):
+        """
+        Run a blocking Gemini SDK call on the worker pool so the event loop stays free.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._pool, functools.partial(func, *args, **kwargs))
     
     def vectorize_metadata(self, metadata):
         """
         Convert metadata dictionary to a vector embedding using Gemini.
         Creates a text representation of the metadata and generates embeddings.
         Supports both invoice and contract metadata.
+        Returns the embedding as a float32 numpy array.
         """
         try:
-            # Create a text representation of the metadata
-            text_parts = []
-            
-            # Handle invoice metadata
-            if metadata.get('invoice_id'):
-                text_parts.append(f"Invoice ID: {metadata['invoice_id']}")
-            if metadata.get('seller_name'):
-                text_parts.append(f"Seller: {metadata['seller_name']}")
-            if metadata.get('seller_address'):
-                text_parts.append(f"Address: {metadata['seller_address']}")
-            if metadata.get('tax_id'):
-                text_parts.append(f"Tax ID: {metadata['tax_id']}")
-            if metadata.get('subtotal_amount'):
-                text_parts.append(f"Subtotal: {metadata['subtotal_amount']}")
-            if metadata.get('tax_amount'):
-                text_parts.append(f"Tax: {metadata['tax_amount']}")
+            text = _metadata_to_text(metadata)
             
-            # Handle contract metadata
-            if metadata.get('contract_id'):
-                text_parts.append(f"Contract ID: {metadata['contract_id']}")
-            if metadata.get('text'):
-                # Include contract text (may be long, but that's okay for embeddings)
-                text_parts.append(f"Text: {metadata['text']}")
-            
-            # Summary is common to both
-            if metadata.get('summary'):
-                text_parts.append(f"Summary: {metadata['summary']}")
-            
-            text = " | ".join(text_parts)
-            
-            # Generate embedding using Gemini
-            result = genai.embed_content(
-                model=self.model,
-                content=text,
-                task_type="RETRIEVAL_DOCUMENT"
-            )
-            
-            # Extract the embedding vector
-            # The google-generativeai package returns an EmbedContentResponse object
-            # Check the actual structure of the response
-            if hasattr(result, 'embedding'):
-                if isinstance(result.embedding, dict):
-                    embedding = result.embedding.get('values', result.embedding)
-                else:
-                    embedding = result.embedding
-            elif isinstance(result, dict):
-                embedding = result.get('embedding', result)
-            else:
-                embedding = result
-            
-            # Ensure we have a list
-            if not isinstance(embedding, list):
-                # Try to get values from the object
-                if hasattr(embedding, 'values'):
-                    embedding = embedding.values
-                elif hasattr(embedding, '__iter__') and not isinstance(embedding, str):
-                    embedding = list(embedding)
-                else:
-                    raise ValueError(f"Unexpected embedding format: {type(embedding)}")
+            # Generate embedding using Gemini (served from the cache when possible)
+            embedding = _embed_document(self.model, text)
             
             # Log the actual dimensions for debugging
-            logger.info(f"Generated embedding with {len(embedding)} dimensions")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Generated embedding with %d dimensions", len(embedding))
             
             return embedding
         except Exception as e:
             logger.error(f"Error vectorizing metadata: {e}")
             raise
     
-    def vectorize_query(self, query_text):
+    def vectorize_metadata_batch(self, metadatas):
+        """
+        Convert a list of metadata dictionaries to embeddings using batched Gemini calls.
+        Up to EMBED_BATCH_SIZE texts are sent per request instead of one round-trip each;
+        texts longer than _MAX_EMBED_CHARS are windowed and averaged individually.
+        
+        Args:
+            metadatas: List of invoice or contract metadata dictionaries
+        
+        Returns:
+            List of float32 numpy arrays in the same order as metadatas
+        """
+        try:
+            texts = [_metadata_to_text(metadata) for metadata in metadatas]
+            short = [i for i, text in enumerate(texts) if len(text) <= _MAX_EMBED_CHARS]
+            embeddings = [None] * len(texts)
+            short_embeddings = _embed_texts(self.model, [texts[i] for i in short], "RETRIEVAL_DOCUMENT")
+            for i, embedding in zip(short, short_embeddings):
+                embeddings[i] = embedding
+            for i, text in enumerate(texts):
+                if embeddings[i] is None:
+                    embeddings[i] = _embed_document(self.model, text)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Generated %d embeddings in batch", len(embeddings))
+            return embeddings
+        except Exception as e:
+            logger.error(f"Error vectorizing metadata batch: {e}")
+            raise
+    
+    def vectorize_query(self, query_text, record=False):
         """
         Convert a query string to a vector embedding using Gemini.
         This is used for semantic search queries.
+
+        Queries are normalized (case, whitespace, trailing punctuation) and then
+        looked up in the embedding cache (in-process LRU, then SQLite), so only
+        the first occurrence of each variant hits the API.
         
         Args:
             query_text: The text query to vectorize
+            record: Count this query towards cache warming on the next start;
+                set only by the user-facing search path
         
         Returns:
-            List of floats representing the embedding vector
+            Read-only float32 numpy array representing the embedding vector
         """
         try:
-            # Generate embedding using Gemini with RETRIEVAL_QUERY task type
-            result = genai.embed_content(
-                model=self.model,
-                content=query_text,
-                task_type="RETRIEVAL_QUERY"
-            )
-            
-            # Extract the embedding vector
-            if hasattr(result, 'embedding'):
-                if isinstance(result.embedding, dict):
-                    embedding = result.embedding.get('values', result.embedding)
-                else:
-                    embedding = result.embedding
-            elif isinstance(result, dict):
-                embedding = result.get('embedding', result)
-            else:
-                embedding = result
-            
-            # Ensure we have a list
-            if not isinstance(embedding, list):
-                if hasattr(embedding, 'values'):
-                    embedding = embedding.values
-                elif hasattr(embedding, '__iter__') and not isinstance(embedding, str):
-                    embedding = list(embedding)
-                else:
-                    raise ValueError(f"Unexpected embedding format: {type(embedding)}")
-            
-            logger.info(f"Generated query embedding with {len(embedding)} dimensions")
-            
+            normalized = _normalize_query(query_text)
+            embedding = _embed_text(self.model, normalized, "RETRIEVAL_QUERY")
+            if record:
+                _get_embedding_cache().record_access(self.model, "RETRIEVAL_QUERY", normalized)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Generated query embedding with %d dimensions", len(embedding))
             return embedding
         except Exception as e:
             logger.error(f"Error vectorizing query: {e}")
             raise
+
+    @staticmethod
+    def cache_info():
+        """
+        Return per-tier hit/miss statistics for the embedding cache.
+        """
+        return _get_embedding_cache().stats()
     
+    async def avectorize_metadata(self, metadata):
+        """
+        Async variant of vectorize_metadata; concurrent calls run in parallel on the worker pool.
+        """
+        return await self._run_in_pool(self.vectorize_metadata, metadata)
+
+    async def avectorize_metadata_batch(self, metadatas):
+        """
+        Async variant of vectorize_metadata_batch.
+        """
+        return await self._run_in_pool(self.vectorize_metadata_batch, metadatas)
+
+    async def avectorize_query(self, query_text, record=False):
+        """
+        Async variant of vectorize_query.
+        """
+        return await self._run_in_pool(self.vectorize_query, query_text, record=record)
+
     def _get_generative_model(self):
         """
-        Initialize a Gemini generative model with graceful fallback to alt models.
+        Return a cached Gemini generative model.
+        The working model name is resolved once per process; later calls skip the fallback ladder.
+        Returns (model_instance, model_name_used)
+        """
+        model_name = Vectorizer._resolved_model_name
+        if model_name is None:
+            return self._resolve_model()
+        model = Vectorizer._model_cache.get(model_name)
+        if model is None:
+            model = Vectorizer._model_cache.setdefault(model_name, genai.GenerativeModel(model_name))
+        return model, model_name
+
+    def _resolve_model(self):
+        """
+        Initialize a Gemini generative model with graceful fallback to alt models,
+        caching the instance and recording which model name worked.
         Returns (model_instance, model_name_used)
         """
         model_name = Config.GEMINI_GENERATION_MODEL
         logger.info(f"Attempting to use model: {model_name}")
         try:
             model = genai.GenerativeModel(model_name)
-            return model, model_name
         except Exception as model_error:
             logger.error(f"Error initializing model '{model_name}': {model_error}")
             alternative_models = ["gemini-1.5-pro", "gemini-1.5-flash", "gemini-pro"]
@@ -155,15 +454,33 @@ class Vectorizer:
                     logger.info(f"Trying alternative model: {alt_model}")
                     model = genai.GenerativeModel(alt_model)
                     logger.info(f"Successfully initialized model: {alt_model}")
-                    return model, alt_model
+                    model_name = alt_model
+                    break
                 except Exception as alt_error:
                     logger.warning(
                         f"Failed to initialize alternative model '{alt_model}': {alt_error}"
                     )
                     continue
-            raise ValueError(
-                f"Could not initialize any Gemini model. Original error: {model_error}"
-            )
+            else:
+                raise ValueError(
+                    f"Could not initialize any Gemini model. Original error: {model_error}"
+                )
+
+        model = Vectorizer._model_cache.setdefault(model_name, model)
+        Vectorizer._resolved_model_name = model_name
+        return model, model_name
+
+    @staticmethod
+    def _log_response_diagnostics(response):
+        """
+        Log the public attributes and __dict__ of an unparseable Gemini response.
+        """
+        logger.error(
+            "Response attributes: %s",
+            [attr for attr in dir(response) if not attr.startswith('_')],
+        )
+        if hasattr(response, '__dict__'):
+            logger.error("Response dict: %s", response.__dict__)
 
     def _extract_text_from_response(self, response):
         """
@@ -199,13 +516,11 @@ class Vectorizer:
             if hasattr(feedback, 'block_reason') and feedback.block_reason:
                 raise ValueError(f"Content was blocked: {feedback.block_reason}")
 
-        logger.error("Could not extract text from Gemini response")
-        logger.error(f"Response type: {type(response)}")
-        logger.error(
-            f"Response attributes: {[attr for attr in dir(response) if not attr.startswith('_')]}"
-        )
-        if hasattr(response, '__dict__'):
-            logger.error(f"Response dict: {response.__dict__}")
+        logger.error("Could not extract text from Gemini response of type %s", type(response))
+        if not Vectorizer._response_diagnostics_logged:
+            # Dump the full response structure only once per process
+            Vectorizer._response_diagnostics_logged = True
+            self._log_response_diagnostics(response)
         raise ValueError("Could not extract answer from Gemini response")
 
     def generate_answer(self, query: str, context_texts: list, contract_ids: list = None):
@@ -227,31 +542,20 @@ class Vectorizer:
                 return "No contract context available to generate an answer."
             
             # Build the context from retrieved contracts
-            context_parts = []
-            for i, text in enumerate(context_texts):
-                if contract_ids and i < len(contract_ids):
-                    context_parts.append(f"Contract ID: {contract_ids[i]}\n{text}")
-                else:
-                    context_parts.append(f"Contract Excerpt {i+1}:\n{text}")
+            num_ids = len(contract_ids) if contract_ids else 0
+            context = _CONTEXT_SEPARATOR.join(
+                f"Contract ID: {contract_ids[i]}\n{text}" if i < num_ids
+                else f"Contract Excerpt {i+1}:\n{text}"
+                for i, text in enumerate(context_texts)
+            )
             
-            context = "\n\n---\n\n".join(context_parts)
-            
-            # Build the prompt for the LLM
-            prompt = f"""You are a helpful assistant that answers questions about contracts based on the provided contract excerpts.
-
-Use the following contract excerpts to answer the user's question. If the information is not available in the provided excerpts, say so clearly.
-
-Contract Excerpts:
-{context}
-
-User Question: {query}
-
-Please provide a clear, accurate answer based on the contract excerpts above. If you reference specific information, mention which contract it comes from if available."""
+            # Build the prompt for the LLM from the precompiled template pieces
+            prompt = "".join((_ANSWER_PROMPT_HEAD, context, _ANSWER_PROMPT_QUESTION, query, _ANSWER_PROMPT_TAIL))
             
             model, model_name = self._get_generative_model()
 
             # Generate response
-            logger.info("Generating response from Gemini...")
+            logger.debug("Generating response from Gemini...")
             try:
                 response = model.generate_content(prompt)
             except Exception as gen_error:
@@ -264,12 +568,24 @@ Please provide a clear, accurate answer based on the contract excerpts above. If
                 logger.error("Generated answer is empty after extraction")
                 raise ValueError("Generated answer is empty")
             
-            logger.info(f"Successfully generated answer using {model_name}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Successfully generated answer using %s", model_name)
             return answer.strip()
         except Exception as e:
             logger.error(f"Error generating answer: {e}", exc_info=True)
             raise
 
+    async def agenerate_answer(self, query: str, context_texts: list, contract_ids: list = None):
+        """
+        Async variant of generate_answer.
+        """
+        return await self._run_in_pool(
+            self.generate_answer,
+            query=query,
+            context_texts=context_texts,
+            contract_ids=contract_ids,
+        )
+
     def extract_pricing_rules(
         self,
         invoice_metadata: dict,
@@ -356,3 +672,12 @@ Do not include any additional text outside of the JSON payload.
                 "raw_response": raw_text,
             }
 
+
+@functools.lru_cache(maxsize=1)
+def get_vectorizer() -> Vectorizer:
+    """
+    Return the process-wide Vectorizer.
+    Sharing one instance avoids repeated genai.configure calls and lets the
+    worker pool, warm-up thread and model cache serve the whole process.
+    """
+    return Vectorizer()